@@ -0,0 +1,137 @@
+// 练习题交互：整页只注册一个委托监听器，答案与解析在首次作答时才加载
+
+(function() {
+    const CORRECT_COLOR = 'var(--success-color)';
+    const WRONG_COLOR = '#ef4444';
+
+    let answersPromise = null;
+
+    // 加载本页答案（answers/NN.json），只请求一次
+    function loadAnswers() {
+        if (!answersPromise) {
+            const src = document.querySelector('[data-answers]').dataset.answers;
+            answersPromise = fetch(src).then(res => {
+                if (!res.ok) {
+                    throw new Error(res.status + ' ' + res.statusText);
+                }
+                return res.json();
+            });
+            // 失败后允许下次重新请求
+            answersPromise.catch(() => { answersPromise = null; });
+        }
+        return answersPromise;
+    }
+
+    function showFeedback(question, isCorrect, item) {
+        const oldFeedback = question.querySelector('.feedback');
+        if (oldFeedback) {
+            oldFeedback.remove();
+        }
+
+        const feedback = document.createElement('div');
+        feedback.className = 'feedback';
+        feedback.style.color = isCorrect ? CORRECT_COLOR : WRONG_COLOR;
+        feedback.textContent = isCorrect ? '✓ 正确！' : '✗ 错误。正确答案是：' + item.answer;
+
+        if (item.explanation) {
+            const small = document.createElement('small');
+            small.textContent = item.explanation;
+            feedback.appendChild(small);
+        }
+
+        question.appendChild(feedback);
+    }
+
+    function showError(container, err) {
+        const feedback = document.createElement('div');
+        feedback.className = 'feedback';
+        feedback.style.color = WRONG_COLOR;
+        feedback.textContent = '答案加载失败：' + err.message;
+        container.querySelector('.feedback')?.remove();
+        container.appendChild(feedback);
+    }
+
+    // 检查单道题目
+    function checkQuestion(question, userAnswer) {
+        const type = question.dataset.type;
+        const index = Number(question.dataset.index);
+
+        loadAnswers().then(answers => {
+            const item = answers[type][index];
+            const isCorrect = type === 'fill_blank'
+                ? userAnswer.trim().toLowerCase() === item.answer.toLowerCase()
+                : userAnswer === item.answer;
+            showFeedback(question, isCorrect, item);
+        }).catch(err => showError(question, err));
+    }
+
+    // 渲染答案解析区域
+    function renderAnswers(container, answers) {
+        const sections = [
+            ['选择题', answers.multiple_choice],
+            ['填空与改写', answers.fill_blank],
+        ];
+
+        const fragment = document.createDocumentFragment();
+        const title = document.createElement('h3');
+        title.textContent = '答案解析';
+        fragment.appendChild(title);
+
+        sections.forEach(([name, items]) => {
+            const heading = document.createElement('h4');
+            heading.textContent = name;
+            fragment.appendChild(heading);
+
+            items.forEach((item, i) => {
+                const p = document.createElement('p');
+                const num = document.createElement('strong');
+                num.textContent = (i + 1) + '.';
+                p.appendChild(num);
+                p.appendChild(document.createTextNode(' 答案：' + item.answer + ' - ' + item.explanation));
+                fragment.appendChild(p);
+            });
+        });
+
+        container.replaceChildren(fragment);
+        container.dataset.rendered = 'true';
+    }
+
+    // 切换答案显示/隐藏
+    function toggleAnswers() {
+        const answersDiv = document.getElementById('answers');
+        if (answersDiv.style.display !== 'none') {
+            answersDiv.style.display = 'none';
+            return;
+        }
+
+        answersDiv.style.display = 'block';
+        if (answersDiv.dataset.rendered) {
+            return;
+        }
+        answersDiv.textContent = '加载中...';
+        loadAnswers()
+            .then(answers => renderAnswers(answersDiv, answers))
+            .catch(err => showError(answersDiv, err));
+    }
+
+    document.addEventListener('click', function(event) {
+        const target = event.target;
+
+        // 选择题：点击单选框
+        if (target.matches('.question input[type="radio"]')) {
+            checkQuestion(target.closest('.question'), target.value);
+            return;
+        }
+
+        // 填空题：点击“检查答案”
+        if (target.matches('.check-btn')) {
+            const question = target.closest('.question');
+            checkQuestion(question, question.querySelector('.fill-input').value);
+            return;
+        }
+
+        if (target.matches('.answers-btn')) {
+            toggleAnswers();
+        }
+    });
+})();
@@ -1,78 +1,112 @@
 #!/usr/bin/env python3
 """
-批量构建所有 HTML 页面
-Usage: uv run python scripts/build_all.py [--force]
+批量构建所有输出（HTML 页面、Markdown 笔记、EPUB 电子书）
+Usage: uv run python scripts/build_all.py [--force] [--formats html,md,epub]
+
+每个内容文件只读取、解析一次，解析结果同时交给所有选中的输出器。
 """
 
 import argparse
-import json
 from pathlib import Path
 
+import build_html
+import build_sw
+import catalog
+import verify_site
+from content_model import load_point
+from renderers import EMITTERS
+
 CONTENT_DIR = Path("content")
-DOCS_DIR = Path("docs")
-
-
-def build_html(input_file: Path) -> bool:
-    """调用 build_html.py 构建单个页面"""
-    import subprocess
-    
-    try:
-        result = subprocess.run(
-            ["python", "scripts/build_html.py", str(input_file)],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        print(result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"  ✗ 构建失败: {e}")
-        print(f"  错误输出: {e.stderr}")
-        return False
+
+
+def is_fresh(output: Path, source: Path) -> bool:
+    """输出文件是否比内容文件新"""
+    return output.exists() and output.stat().st_mtime >= source.stat().st_mtime
 
 
 def main():
-    parser = argparse.ArgumentParser(description="批量构建所有 HTML 页面")
+    parser = argparse.ArgumentParser(description="批量构建所有输出")
     parser.add_argument("--force", action="store_true", help="强制重新构建")
-    
+    parser.add_argument("--formats", type=str, default="html",
+                        help=f"输出格式，逗号分隔 (可选: {','.join(EMITTERS)}，默认: html)")
+
     args = parser.parse_args()
-    
-    # 获取所有 JSON 文件
-    json_files = sorted(CONTENT_DIR.glob("[0-9][0-9].json"))
-    
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in EMITTERS]
+    if unknown:
+        parser.error(f"未知的输出格式: {', '.join(unknown)}")
+    emitters = {name: EMITTERS[name]() for name in formats}
+
+    config = catalog.load_config()
+
+    # 获取所有 JSON 文件（含分类子目录；构建顺序不影响输出，无需排序）
+    json_files = list(catalog.iter_content_files(CONTENT_DIR))
+
     if not json_files:
         print("没有找到 JSON 文件，请先运行 generate_content.py 生成内容")
         return
-    
+
     print(f"=" * 50)
-    print(f"开始构建 HTML 页面 ({len(json_files)} 个)")
+    print(f"开始构建 {', '.join(formats)} ({len(json_files)} 个知识点)")
     print(f"=" * 50)
-    
+
+    # 检查每个输出器需要处理哪些文件；汇总型输出（EPUB）只要有一处变化就需要全部知识点
+    pending = {}
+    for name, emitter in emitters.items():
+        stale = {f for f in json_files
+                 if args.force or not is_fresh(emitter.output_for(f.relative_to(CONTENT_DIR)), f)}
+        if emitter.aggregate and stale:
+            stale = set(json_files)
+        pending[name] = stale
+
     success_count = 0
     fail_count = 0
-    
+
     for json_file in json_files:
         point_id = json_file.stem
-        html_file = DOCS_DIR / f"{point_id}.html"
-        
-        # 检查是否需要构建
-        if html_file.exists() and not args.force:
-            # 比较修改时间
-            if html_file.stat().st_mtime >= json_file.stat().st_mtime:
-                print(f"\n[{point_id}] HTML 已是最新，跳过")
-                success_count += 1
-                continue
-        
-        print(f"\n[{point_id}] 构建中...")
-        if build_html(json_file):
+        targets = [name for name in formats if json_file in pending[name]]
+
+        if not targets:
+            print(f"\n[{point_id}] 已是最新，跳过")
             success_count += 1
-        else:
+            continue
+
+        print(f"\n[{point_id}] 构建中 ({', '.join(targets)})...")
+        try:
+            point = load_point(json_file)
+            # 输出路径由内容中的序号决定，与文件名不一致时会覆盖其他知识点的页面
+            if point.index < 1 or catalog.normalize_id(config, point.index) != point_id:
+                raise ValueError(f"内容中的序号 {point.index} 与文件名 {json_file.name} 不一致")
+            for name in targets:
+                emitters[name].emit(point)
+            success_count += 1
+        except (KeyError, TypeError, ValueError, IndexError, OSError) as e:
+            print(f"  ✗ 构建失败: {e!r}")
             fail_count += 1
-    
+
+    for name, emitter in emitters.items():
+        if pending[name]:
+            emitter.finish()
+
     print(f"\n" + "=" * 50)
     print(f"构建完成: 成功 {success_count} 个, 失败 {fail_count} 个")
     print(f"=" * 50)
 
+    # 同步首页的知识点总数，生成离线缓存清单与 Service Worker，并检查站内链接
+    if "html" in emitters:
+        print()
+        build_html.update_index_total(catalog.load_config())
+        build_sw.main()
+        
+        report = verify_site.verify()
+        print(f"\n站点检查: {report['pages']} 个页面, {report['references']} 个站内引用, "
+              f"{len(report['broken'])} 个问题")
+        for item in report["broken"][:10]:
+            print(f"  ✗ {item['page']}:{item['line']} {item['url']} ({item['reason']})")
+        if len(report["broken"]) > 10:
+            print(f"  ... 运行 make verify 查看完整报告")
+
 
 if __name__ == "__main__":
     main()
@@ -10,16 +10,17 @@ import re
 import sys
 from pathlib import Path
 
+import catalog
+from content_model import GrammarPoint, load_point
+
 # 路径配置
 TEMPLATE_PATH = Path("templates/grammar_page.html")
 OUTPUT_DIR = Path("docs")
-CONFIG_PATH = Path("config/grammar_points.json")
-
+ANSWERS_DIR = OUTPUT_DIR / "answers"
+INDEX_PATH = OUTPUT_DIR / "index.html"
 
-def load_json(file_path: str) -> dict:
-    """加载 JSON 文件"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+# 首页（手工维护）<body> 上的知识点总数，供 main.js 计算学习进度
+INDEX_TOTAL_RE = re.compile(r'(<body\b[^>]*\bdata-total=")\d*(")')
 
 
 def load_template() -> str:
@@ -30,20 +31,14 @@ def load_template() -> str:
 
 def load_config():
     """加载配置获取导航信息"""
-    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return catalog.load_config()
 
 
-def get_navigation(config, current_index: int):
-    """获取上一页/下一页链接"""
-    all_points = []
-    for cat in config["categories"]:
-        for point in cat["points"]:
-            all_points.append({
-                "id": point["id"],
-                "name": point["name"],
-                "category_id": cat["id"]
-            })
+def get_navigation(config, current_index: int, all_points: list = None):
+    """获取上一页/下一页链接（批量构建时传入 all_points 避免重复展开配置）"""
+    if all_points is None:
+        all_points = list(catalog.iter_points(config))
+    root = catalog.root_prefix(config)
     
     prev_link = ""
     next_link = ""
@@ -51,16 +46,25 @@ def get_navigation(config, current_index: int):
     # 上一页
     if current_index > 1:
         prev_point = all_points[current_index - 2]
-        prev_link = f'<a href="{prev_point["id"]}.html" class="prev">← 上一节：{prev_point["name"]}</a>'
+        prev_link = f'<a href="{root}{catalog.page_url(config, prev_point)}" class="prev">← 上一节：{prev_point["name"]}</a>'
     
     # 下一页
     if current_index < len(all_points):
         next_point = all_points[current_index]
-        next_link = f'<a href="{next_point["id"]}.html" class="next">下一节：{next_point["name"]} →</a>'
+        next_link = f'<a href="{root}{catalog.page_url(config, next_point)}" class="next">下一节：{next_point["name"]} →</a>'
     
     return prev_link, next_link
 
 
+def point_meta(config, index: int, all_points: list = None) -> dict:
+    """根据序号获取知识点在目录中的信息（ID、分类 ID 等），序号超出目录范围时抛出 ValueError"""
+    if all_points is None:
+        all_points = list(catalog.iter_points(config))
+    if not 1 <= index <= len(all_points):
+        raise ValueError(f"序号 {index} 超出范围 (1-{len(all_points)})")
+    return all_points[index - 1]
+
+
 def render_usage_scenarios(scenarios: list) -> str:
     """渲染使用场景列表"""
     return "\n".join([f"                    <li>{s}</li>" for s in scenarios])
@@ -70,7 +74,7 @@ def render_key_points(points: list) -> str:
     """渲染关键规则点"""
     html = []
     for i, p in enumerate(points, 1):
-        html.append(f'<div class="key-point"><h4>{i}. {p["point"]}</h4><p>{p["explanation"]}</p></div>')
+        html.append(f'<div class="key-point"><h4>{i}. {p.point}</h4><p>{p.explanation}</p></div>')
     return "\n".join(html)
 
 
@@ -78,81 +82,87 @@ def render_examples(examples: list) -> str:
     """渲染例句"""
     html = []
     for ex in examples:
-        html.append(f'<div class="example-item"><p class="sentence">{ex["sentence"]}</p><p class="translation">{ex["translation"]}</p><p class="analysis">{ex["analysis"]}</p></div>')
+        html.append(f'<div class="example-item"><p class="sentence">{ex.sentence}</p><p class="translation">{ex.translation}</p><p class="analysis">{ex.analysis}</p></div>')
     return "\n".join(html)
 
 
 def render_multiple_choice(questions: list) -> str:
-    """渲染选择题"""
+    """渲染选择题（答案由 quiz.js 按需加载）"""
     html = []
     for i, q in enumerate(questions, 1):
-        options_html = "\n".join([f'<label><input type="radio" name="q{i}" value="{opt[0]}"> {opt}</label>' for opt in q['options']])
-        html.append(f'<div class="question" data-answer="{q["answer"]}" data-explanation="{q["explanation"]}"><p class="q-text">{i}. {q["question"]}</p><div class="options">{options_html}</div></div>')
+        options_html = "\n".join([f'<label><input type="radio" name="q{i}" value="{opt[0]}"> {opt}</label>' for opt in q.options])
+        html.append(f'<div class="question" data-type="multiple_choice" data-index="{i - 1}"><p class="q-text">{i}. {q.question}</p><div class="options">{options_html}</div></div>')
     return "\n".join(html)
 
 
 def render_fill_blank(questions: list) -> str:
-    """渲染填空题"""
+    """渲染填空题（答案由 quiz.js 按需加载）"""
     html = []
     for i, q in enumerate(questions, 1):
-        html.append(f'<div class="question" data-answer="{q["answer"]}" data-explanation="{q["explanation"]}"><p class="q-text">{i}. {q["question"]}</p><input type="text" class="fill-input" placeholder="请输入答案"></div>')
+        html.append(f'<div class="question" data-type="fill_blank" data-index="{i - 1}"><p class="q-text">{i}. {q.question}</p><input type="text" class="fill-input" placeholder="请输入答案"><button type="button" class="check-btn">检查答案</button></div>')
     return "\n".join(html)
 
 
-def render_answers(data: dict) -> str:
-    """渲染答案部分"""
-    html = ["<h3>答案解析</h3>"]
-    
-    # 选择题答案
-    html.append("<h4>选择题</h4>")
-    for i, q in enumerate(data['exercises']['multiple_choice'], 1):
-        html.append(f"<p><strong>{i}.</strong> 答案：{q['answer']} - {q['explanation']}</p>")
-    
-    # 填空题答案
-    html.append("<h4>填空与改写</h4>")
-    for i, q in enumerate(data['exercises']['fill_blank'], 1):
-        html.append(f"<p><strong>{i}.</strong> 答案：{q['answer']} - {q['explanation']}</p>")
-    
-    return "\n".join(html)
+def build_answers(point: GrammarPoint) -> dict:
+    """提取练习题答案与解析，单独输出供页面按需加载"""
+    return {
+        kind: [{"answer": q.answer, "explanation": q.explanation} for q in getattr(point, kind)]
+        for kind in ("multiple_choice", "fill_blank")
+    }
 
 
-def render_related_points(points: list) -> str:
-    """渲染相关知识点"""
-    return "\n".join([f'<a href="#" class="related-tag">{p}</a>' for p in points])
+def render_related_points(points: list, config: dict, all_points: list) -> str:
+    """渲染相关知识点：能在目录中找到的链接到对应页面，其余只显示名称"""
+    by_name = {p["name"]: p for p in all_points}
+    root = catalog.root_prefix(config)
+    html = []
+    for name in points:
+        target = by_name.get(name)
+        if target:
+            html.append(f'<a href="{root}{catalog.page_url(config, target)}" class="related-tag">{name}</a>')
+        else:
+            html.append(f'<span class="related-tag">{name}</span>')
+    return "\n".join(html)
 
 
-def build_html(data: dict) -> str:
-    """构建 HTML 页面"""
-    template = load_template()
-    config = load_config()
+def build_html(point: GrammarPoint, template: str = None, config: dict = None, all_points: list = None) -> str:
+    """构建 HTML 页面（批量构建时可传入已加载的模板和配置）"""
+    template = template or load_template()
+    config = config or load_config()
+    if all_points is None:
+        all_points = list(catalog.iter_points(config))
+    meta = point_meta(config, point.index, all_points)
+    root = catalog.root_prefix(config)
     
     # 获取导航
-    prev_link, next_link = get_navigation(config, data['index'])
+    prev_link, next_link = get_navigation(config, point.index, all_points)
     
-    # 找到当前分类 ID
-    category_id = ""
+    # 找到当前分类 ID（内容中的分类名与配置不一致时使用目录中该序号所属的分类）
+    category_id = meta["category_id"]
     for cat in config["categories"]:
-        if cat["name"] == data['category']:
+        if cat["name"] == point.category:
             category_id = cat["id"]
             break
     
     # 替换模板变量
     replacements = {
-        "{{GRAMMAR_POINT}}": data['grammar_point'],
-        "{{CATEGORY}}": data['category'],
+        "{{GRAMMAR_POINT}}": point.grammar_point,
+        "{{CATEGORY}}": point.category,
         "{{CATEGORY_ID}}": category_id,
-        "{{INDEX}}": str(data['index']),
-        "{{NAME_EN}}": data.get('name_en', ''),
-        "{{OVERVIEW_FUNCTION}}": data['content']['overview']['function'],
-        "{{USAGE_SCENARIOS}}": render_usage_scenarios(data['content']['overview']['usage_scenarios']),
-        "{{RULES_DESCRIPTION}}": data['content']['rules']['description'],
-        "{{KEY_POINTS}}": render_key_points(data['content']['rules']['key_points']),
-        "{{EXAMPLES}}": render_examples(data['content']['examples']),
-        "{{MULTIPLE_CHOICE}}": render_multiple_choice(data['content']['exercises']['multiple_choice']),
-        "{{FILL_BLANK}}": render_fill_blank(data['content']['exercises']['fill_blank']),
-        "{{ANSWERS}}": render_answers(data['content']),
-        "{{SUMMARY}}": data['content']['summary'],
-        "{{RELATED_POINTS}}": render_related_points(data['content']['related_points']),
+        "{{INDEX}}": str(point.index),
+        "{{TOTAL}}": str(catalog.total_count(config)),
+        "{{ROOT}}": root,
+        "{{NAME_EN}}": point.name_en,
+        "{{OVERVIEW_FUNCTION}}": point.overview_function,
+        "{{USAGE_SCENARIOS}}": render_usage_scenarios(point.usage_scenarios),
+        "{{RULES_DESCRIPTION}}": point.rules_description,
+        "{{KEY_POINTS}}": render_key_points(point.key_points),
+        "{{EXAMPLES}}": render_examples(point.examples),
+        "{{MULTIPLE_CHOICE}}": render_multiple_choice(point.multiple_choice),
+        "{{FILL_BLANK}}": render_fill_blank(point.fill_blank),
+        "{{ANSWERS_SRC}}": root + answers_path(config, meta, Path("answers")).as_posix(),
+        "{{SUMMARY}}": point.summary,
+        "{{RELATED_POINTS}}": render_related_points(point.related_points, config, all_points),
         "{{PREV_LINK}}": prev_link,
         "{{NEXT_LINK}}": next_link,
     }
@@ -164,15 +174,44 @@ def build_html(data: dict) -> str:
     return html
 
 
-def save_html(index: int, content: str):
+def answers_path(config, meta: dict, base_dir: Path = ANSWERS_DIR) -> Path:
+    """答案 JSON 文件路径"""
+    return catalog.point_path(config, base_dir, meta, ".json")
+
+
+def save_html(config, meta: dict, content: str):
     """保存 HTML 文件"""
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    output_path = OUTPUT_DIR / f"{str(index).zfill(2)}.html"
+    output_path = catalog.point_path(config, OUTPUT_DIR, meta, ".html")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(content)
     print(f"HTML 页面已保存到: {output_path}")
 
 
+def update_index_total(config) -> bool:
+    """将首页的 data-total 同步为配置中的知识点总数，内容有变化时返回 True"""
+    if not INDEX_PATH.exists():
+        return False
+    with open(INDEX_PATH, 'r', encoding='utf-8') as f:
+        page = f.read()
+    updated = INDEX_TOTAL_RE.sub(rf"\g<1>{catalog.total_count(config)}\g<2>", page, count=1)
+    if updated == page:
+        return False
+    with open(INDEX_PATH, 'w', encoding='utf-8') as f:
+        f.write(updated)
+    print(f"首页知识点总数已更新: {INDEX_PATH}")
+    return True
+
+
+def save_answers(config, meta: dict, answers: dict):
+    """保存答案 JSON 文件"""
+    output_path = answers_path(config, meta)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(answers, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"答案文件已保存到: {output_path}")
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python scripts/build_html.py <input_json_file>")
@@ -186,15 +225,18 @@ def main():
         sys.exit(1)
     
     # 加载数据
-    data = load_json(input_file)
+    point = load_point(input_file)
     
     # 构建 HTML
-    html = build_html(data)
+    config = load_config()
+    html = build_html(point, config=config)
     
     # 保存
-    save_html(data['index'], html)
+    meta = point_meta(config, point.index)
+    save_html(config, meta, html)
+    save_answers(config, meta, build_answers(point))
     
-    print(f"\n✅ 成功生成页面: {data['grammar_point']}")
+    print(f"\n✅ 成功生成页面: {point.grammar_point}")
 
 
 if __name__ == "__main__":
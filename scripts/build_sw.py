@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+生成离线缓存所需的 Service Worker 与预缓存清单
+Usage: uv run python scripts/build_sw.py
+
+遍历 docs/ 下的所有页面和静态资源，按内容计算哈希写入 docs/precache-manifest.json，
+并根据 templates/sw.js 生成 docs/sw.js。清单版本由所有资源的哈希决定，
+内容未变的页面在浏览器端会直接复用已有缓存，不会重新下载。
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+# 路径配置
+DOCS_DIR = Path("docs")
+SW_TEMPLATE_PATH = Path("templates/sw.js")
+SW_PATH = DOCS_DIR / "sw.js"
+MANIFEST_PATH = DOCS_DIR / "precache-manifest.json"
+
+# 不参与预缓存的文件
+EXCLUDE = {SW_PATH.name, MANIFEST_PATH.name}
+
+
+def file_revision(path: Path) -> str:
+    """计算文件内容哈希"""
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def collect_entries() -> list:
+    """收集 docs/ 下需要预缓存的文件"""
+    entries = []
+    for path in sorted(DOCS_DIR.rglob("*")):
+        rel = path.relative_to(DOCS_DIR)
+        if not path.is_file() or str(rel) in EXCLUDE:
+            continue
+        if any(part.startswith(".") for part in rel.parts):
+            continue
+        entries.append({"url": rel.as_posix(), "revision": file_revision(path)})
+    return entries
+
+
+def build_manifest() -> dict:
+    """构建预缓存清单，版本号由全部资源的哈希决定"""
+    entries = collect_entries()
+    digest = hashlib.sha256()
+    for entry in entries:
+        digest.update(f"{entry['url']}\0{entry['revision']}\n".encode("utf-8"))
+    return {"version": digest.hexdigest()[:16], "entries": entries}
+
+
+def save_manifest(manifest: dict):
+    """保存预缓存清单"""
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"预缓存清单已保存到: {MANIFEST_PATH} ({len(manifest['entries'])} 个文件)")
+
+
+def save_service_worker(version: str):
+    """根据模板生成 sw.js"""
+    with open(SW_TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+        template = f.read()
+    with open(SW_PATH, 'w', encoding='utf-8') as f:
+        f.write(template.replace("{{BUILD_VERSION}}", version))
+    print(f"Service Worker 已保存到: {SW_PATH} (版本 {version})")
+
+
+def main():
+    manifest = build_manifest()
+    save_manifest(manifest)
+    save_service_worker(manifest["version"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+知识点目录：ID 格式、文件路径与内容发现
+所有脚本通过这里获取知识点信息，知识点数量由 config/grammar_points.json 的 total_count 决定
+
+- ID 位数随 total_count 增长（24 个为 01，1000 个以上为 0001），load_config 检查配置中的 ID 与之一致
+- total_count 超过 SHARD_THRESHOLD 时，提示词、内容和页面按分类分目录存放
+  （如 content/simple_sentence/0001.json、docs/simple_sentence/0001.html），
+  24 个知识点的现有目录结构和页面地址保持不变
+"""
+
+import json
+import os
+from pathlib import Path
+
+CONFIG_PATH = Path("config/grammar_points.json")
+
+# 超过该数量时按分类分目录
+SHARD_THRESHOLD = 1000
+
+
+def load_config():
+    """加载知识点配置，并检查知识点 ID 的位数与 total_count 一致"""
+    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    check_ids(config)
+    return config
+
+
+def check_ids(config):
+    """ID 位数由 total_count 决定（见 id_width），不一致时命令行输入的 ID 无法匹配
+
+    total_count 跨过 99、999 等位数边界时需要同时为所有知识点重新编号，
+    并相应重命名已有的提示词、内容和页面文件（页面地址会随之改变）。
+    """
+    width = id_width(config)
+    bad = [point["id"] for cat in config["categories"] for point in cat["points"]
+           if len(point["id"]) != width or not point["id"].isdigit()]
+    if bad:
+        sample = ", ".join(bad[:5]) + (" ..." if len(bad) > 5 else "")
+        raise ValueError(f"{CONFIG_PATH} 中有 {len(bad)} 个知识点 ID 不是 {width} 位数字"
+                         f"（total_count={total_count(config)}）: {sample}")
+
+
+def total_count(config) -> int:
+    """知识点总数"""
+    return config.get("total_count") or sum(len(cat["points"]) for cat in config["categories"])
+
+
+def id_width(config) -> int:
+    """ID 位数（至少两位）"""
+    return max(2, len(str(total_count(config))))
+
+
+def normalize_id(config, raw) -> str:
+    """将用户输入的 ID（如 5、05、0005）规范为配置中的格式"""
+    return str(int(raw)).zfill(id_width(config))
+
+
+def range_ids(config, start_id, end_id=None) -> list:
+    """范围内的知识点 ID（end_id 为空时到最后一个知识点）"""
+    end_num = int(end_id) if end_id else total_count(config)
+    return [normalize_id(config, i) for i in range(int(start_id), end_num + 1)]
+
+
+def is_sharded(config) -> bool:
+    """是否按分类分目录存放"""
+    return total_count(config) > SHARD_THRESHOLD
+
+
+def iter_points(config):
+    """按配置顺序遍历所有知识点"""
+    for cat in config["categories"]:
+        for point in cat["points"]:
+            yield {
+                "id": point["id"],
+                "name": point["name"],
+                "name_en": point.get("name_en", ""),
+                "category": cat["name"],
+                "category_id": cat["id"],
+            }
+
+
+def point_index(config) -> dict:
+    """ID -> 知识点信息"""
+    return {point["id"]: point for point in iter_points(config)}
+
+
+def point_path(config, base_dir: Path, point: dict, suffix: str, prefix: str = "") -> Path:
+    """知识点对应的文件路径，如 point_path(config, CONTENT_DIR, point, ".json")"""
+    if is_sharded(config):
+        base_dir = base_dir / point["category_id"]
+    return base_dir / f"{prefix}{point['id']}{suffix}"
+
+
+def page_url(config, point: dict) -> str:
+    """页面相对于站点根目录的地址"""
+    return point_path(config, Path(), point, ".html").as_posix()
+
+
+def root_prefix(config) -> str:
+    """从页面所在目录回到站点根目录的相对路径"""
+    return "../" if is_sharded(config) else ""
+
+
+def iter_content_files(content_dir: Path):
+    """遍历内容目录（含分类子目录）中的知识点 JSON 文件，不做排序"""
+    if not content_dir.is_dir():
+        return
+    with os.scandir(content_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                yield from iter_content_files(Path(entry.path))
+            elif entry.name.endswith(".json") and entry.name[:-5].isdigit():
+                yield Path(entry.path)
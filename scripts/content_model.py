@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+知识点内容的数据模型
+每个 content/NN.json 只解析一次，得到的 GrammarPoint 交给各个输出格式使用
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class KeyPoint:
+    point: str
+    explanation: str
+
+
+@dataclass
+class Example:
+    sentence: str
+    translation: str
+    analysis: str
+
+
+@dataclass
+class MultipleChoice:
+    question: str
+    options: list
+    answer: str
+    explanation: str
+
+
+@dataclass
+class FillBlank:
+    question: str
+    answer: str
+    explanation: str
+
+
+@dataclass
+class GrammarPoint:
+    grammar_point: str
+    category: str
+    index: int
+    name_en: str
+    overview_function: str
+    usage_scenarios: list
+    rules_description: str
+    key_points: list = field(default_factory=list)
+    examples: list = field(default_factory=list)
+    multiple_choice: list = field(default_factory=list)
+    fill_blank: list = field(default_factory=list)
+    summary: str = ""
+    related_points: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GrammarPoint":
+        """从 DeepSeek 生成的 JSON 结构构建模型"""
+        content = data['content']
+        exercises = content['exercises']
+        return cls(
+            grammar_point=data['grammar_point'],
+            category=data['category'],
+            index=int(data['index']),
+            name_en=data.get('name_en', ''),
+            overview_function=content['overview']['function'],
+            usage_scenarios=list(content['overview']['usage_scenarios']),
+            rules_description=content['rules']['description'],
+            key_points=[KeyPoint(p['point'], p['explanation']) for p in content['rules']['key_points']],
+            examples=[Example(e['sentence'], e['translation'], e['analysis']) for e in content['examples']],
+            multiple_choice=[
+                MultipleChoice(q['question'], list(q['options']), q['answer'], q['explanation'])
+                for q in exercises['multiple_choice']
+            ],
+            fill_blank=[FillBlank(q['question'], q['answer'], q['explanation']) for q in exercises['fill_blank']],
+            summary=content['summary'],
+            related_points=list(content['related_points']),
+        )
+
+
+def load_point(file_path) -> GrammarPoint:
+    """读取并解析单个内容文件"""
+    with open(Path(file_path), 'r', encoding='utf-8') as f:
+        return GrammarPoint.from_dict(json.load(f))
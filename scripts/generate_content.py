@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 调用 DeepSeek API 生成所有知识点的内容
-Usage: uv run python scripts/generate_content.py [--start 01] [--end 24] [--single 05]
+Usage: uv run python scripts/generate_content.py [--start 01] [--end N] [--single 05]
+       uv run python scripts/generate_content.py --worker [--workers 4] [--start 01] [--end N]
 
 环境变量:
     DEEPSEEK_API_KEY: DeepSeek API 密钥
@@ -12,41 +13,42 @@ import json
 import os
 import sys
 import time
+from multiprocessing import Process
 from pathlib import Path
 
+import catalog
+from content_model import GrammarPoint
+from generate_prompt import prompt_path
+from json_repair import describe, extract_json
+from prompt_template import SYSTEM_PROMPT
+from scheduler import Scheduler, parse_priorities
+from token_budget import TokenBudget
+from work_queue import Heartbeat, WorkQueue, default_worker_id
+
 # DeepSeek API 配置
 DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY")
 DEEPSEEK_BASE_URL = "https://api.deepseek.com"
 MODEL = "deepseek-chat"  # 或 "deepseek-reasoner"
+TEMPERATURE = 0.7
 
 # 路径配置
-PROMPTS_DIR = Path("prompts/generated")
 CONTENT_DIR = Path("content")
-CONFIG_PATH = Path("config/grammar_points.json")
 
 
-def load_config():
-    """加载知识点配置"""
-    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-        return json.load(f)
+def get_point_info(config, point_id: str, points: dict = None):
+    """根据 ID 获取知识点信息（批量生成时传入 catalog.point_index 的结果避免重复查找）"""
+    points = points if points is not None else catalog.point_index(config)
+    return points.get(point_id)
 
 
-def get_point_info(config, point_id: str):
-    """根据 ID 获取知识点信息"""
-    for cat in config["categories"]:
-        for point in cat["points"]:
-            if point["id"] == point_id:
-                return {
-                    "id": point["id"],
-                    "name": point["name"],
-                    "category": cat["name"]
-                }
-    return None
+def content_path(config, point: dict) -> Path:
+    """内容文件路径"""
+    return catalog.point_path(config, CONTENT_DIR, point, ".json")
 
 
-def load_prompt(point_id: str) -> str:
+def load_prompt(config, point: dict) -> str:
     """加载提示词文件"""
-    prompt_file = PROMPTS_DIR / f"prompt_{point_id}.txt"
+    prompt_file = prompt_path(config, point)
     if not prompt_file.exists():
         raise FileNotFoundError(f"提示词文件不存在: {prompt_file}")
     
@@ -54,8 +56,8 @@ def load_prompt(point_id: str) -> str:
         return f.read()
 
 
-def call_deepseek_api(prompt: str) -> str:
-    """调用 DeepSeek API"""
+def call_deepseek_api(prompt: str, max_tokens: int):
+    """调用 DeepSeek API，返回 (内容, finish_reason, 用量)"""
     from openai import OpenAI
     
     if not DEEPSEEK_API_KEY:
@@ -66,94 +68,127 @@ def call_deepseek_api(prompt: str) -> str:
         base_url=DEEPSEEK_BASE_URL
     )
     
-    print("  正在调用 DeepSeek API...")
+    print(f"  正在调用 DeepSeek API (max_tokens={max_tokens})...")
     
     response = client.chat.completions.create(
         model=MODEL,
         messages=[
-            {"role": "system", "content": "你是一位专业的英语语法教学专家，擅长用中文清晰讲解英语语法概念。请严格按照用户要求的 JSON 格式输出。"},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
-        temperature=0.7,
-        max_tokens=4000,
+        temperature=TEMPERATURE,
+        max_tokens=max_tokens,
         stream=False
     )
     
-    return response.choices[0].message.content
+    choice = response.choices[0]
+    usage = {
+        "prompt_tokens": response.usage.prompt_tokens,
+        "completion_tokens": response.usage.completion_tokens,
+        # DeepSeek 上下文缓存命中情况（非 OpenAI 标准字段）
+        "prompt_cache_hit_tokens": getattr(response.usage, "prompt_cache_hit_tokens", None) or 0,
+        "prompt_cache_miss_tokens": getattr(response.usage, "prompt_cache_miss_tokens", None) or 0,
+    }
+    return choice.message.content, choice.finish_reason, usage
 
 
-def extract_json(content: str) -> dict:
-    """从 API 响应中提取 JSON"""
-    # 尝试直接解析
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        pass
-    
-    # 尝试从 Markdown 代码块中提取
-    import re
-    
-    # 匹配 ```json ... ``` 或 ``` ... ```
-    patterns = [
-        r'```json\s*(.*?)\s*```',
-        r'```\s*(.*?)\s*```',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, content, re.DOTALL)
-        if match:
-            try:
-                return json.loads(match.group(1))
-            except json.JSONDecodeError:
-                continue
+def call_with_budget(prompt: str, point_info: dict, budget: TokenBudget) -> str:
+    """按历史用量设置 max_tokens 调用 API，被截断时放大预算重试"""
+    max_tokens = budget.suggest_max_tokens(point_info["id"], point_info["category"])
     
-    raise ValueError("无法从响应中提取有效的 JSON")
+    while True:
+        started = time.monotonic()
+        content, finish_reason, usage = call_deepseek_api(prompt, max_tokens)
+        usage.update({
+            "category": point_info["category"],
+            "max_tokens": max_tokens,
+            "finish_reason": finish_reason,
+            "latency": round(time.monotonic() - started, 2),
+        })
+        budget.record(point_info["id"], point_info["category"], usage)
+        print(f"  用量: prompt {usage['prompt_tokens']} "
+              f"(缓存命中 {usage['prompt_cache_hit_tokens']}, 未命中 {usage['prompt_cache_miss_tokens']}), "
+              f"completion {usage['completion_tokens']}")
+        
+        if finish_reason != "length":
+            return content
+        
+        max_tokens = budget.grow(max_tokens)
+        if max_tokens is None:
+            raise ValueError("响应被截断，且 max_tokens 已达上限")
+        print(f"  ⚠ 响应被截断，使用 max_tokens={max_tokens} 重试")
 
 
-def save_content(point_id: str, data: dict):
-    """保存生成的内容"""
-    CONTENT_DIR.mkdir(parents=True, exist_ok=True)
-    output_file = CONTENT_DIR / f"{point_id}.json"
+def save_content(output_file: Path, data: dict):
+    """保存生成的内容（先写临时文件再替换，避免留下写了一半的文件）"""
+    output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_file, 'w', encoding='utf-8') as f:
+    tmp_file = output_file.with_name(f"{output_file.name}.{os.getpid()}.tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, output_file)
     
     print(f"  ✓ 已保存: {output_file}")
 
 
-def generate_single(point_id: str, config: dict, delay: float = 1.0):
+def generate_data(config: dict, point_info: dict, budget: TokenBudget) -> dict:
+    """调用 API 生成单个知识点的内容并校验结构（不保存）"""
+    # 加载提示词
+    prompt = load_prompt(config, point_info)
+    
+    # 调用 API
+    response = call_with_budget(prompt, point_info, budget)
+    
+    # 提取 JSON，格式小错误直接修复，不重新调用 API
+    data, repairs = extract_json(response)
+    if "truncated" in repairs:
+        # 在字符串或元素中间截断时补全会丢失内容，不能保存；
+        # 只缺少结尾括号（unclosed-brackets）的响应交给下面的结构校验
+        raise ValueError("响应不完整（JSON 被截断）")
+    if repairs:
+        print(f"  ⚠ 已修复 JSON: {describe(repairs)}")
+    
+    # 名称、分类、序号由目录决定，不依赖模型照抄（序号决定页面路径）
+    expected = {
+        "grammar_point": point_info["name"],
+        "category": point_info["category"],
+        "index": int(point_info["id"]),
+    }
+    corrected = [key for key, value in expected.items() if data.get(key) != value]
+    if corrected:
+        print(f"  ⚠ 已按目录更正: {', '.join(corrected)}")
+    data = {**expected, **data, **expected}  # 三个字段保持在最前
+    
+    # 验证数据结构（与构建时使用同一模型，避免保存无法构建的内容）
+    try:
+        GrammarPoint.from_dict(data)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"内容结构不完整: {e!r}") from None
+    
+    return data
+
+
+def generate_single(point_id: str, config: dict, delay: float = 1.0, budget: TokenBudget = None,
+                    points: dict = None):
     """生成单个知识点的内容"""
-    point_info = get_point_info(config, point_id)
+    point_info = get_point_info(config, point_id, points)
     if not point_info:
         print(f"错误: 找不到 ID 为 {point_id} 的知识点")
         return False
     
-    print(f"\n[{point_id}/24] {point_info['name']} ({point_info['category']})")
+    print(f"\n[{point_id}/{catalog.total_count(config)}] {point_info['name']} ({point_info['category']})")
     
     # 检查是否已存在
-    output_file = CONTENT_DIR / f"{point_id}.json"
+    output_file = content_path(config, point_info)
     if output_file.exists():
         print(f"  ⚠ 文件已存在，跳过（使用 --force 覆盖）")
         return True
     
     try:
-        # 加载提示词
-        prompt = load_prompt(point_id)
-        
-        # 调用 API
-        response = call_deepseek_api(prompt)
-        
-        # 提取 JSON
-        data = extract_json(response)
-        
-        # 验证数据结构
-        required_fields = ["grammar_point", "category", "index", "content"]
-        for field in required_fields:
-            if field not in data:
-                raise ValueError(f"缺少必要字段: {field}")
+        data = generate_data(config, point_info, budget or TokenBudget())
         
         # 保存
-        save_content(point_id, data)
+        save_content(output_file, data)
         
         # 延迟，避免请求过快
         if delay > 0:
@@ -166,12 +201,17 @@ def generate_single(point_id: str, config: dict, delay: float = 1.0):
         return False
 
 
-def generate_range(start_id: str, end_id: str, force: bool = False):
-    """生成指定范围的知识点"""
-    config = load_config()
+def generate_range(start_id: str, end_id: str = None, force: bool = False, priorities: dict = None):
+    """生成指定范围的知识点（按优先级和预计耗时从长到短的顺序）"""
+    config = catalog.load_config()
+    budget = TokenBudget()
+    points = catalog.point_index(config)
+    total = catalog.total_count(config)
+    scheduler = Scheduler(config, budget, priorities)
     
-    start_num = int(start_id)
-    end_num = int(end_id)
+    point_ids = catalog.range_ids(config, start_id, end_id)
+    if point_ids:
+        start_id, end_id = point_ids[0], point_ids[-1]
     
     success_count = 0
     fail_count = 0
@@ -180,33 +220,119 @@ def generate_range(start_id: str, end_id: str, force: bool = False):
     print(f"开始生成知识点内容 [{start_id} - {end_id}]")
     print(f"=" * 50)
     
-    for i in range(start_num, end_num + 1):
-        point_id = f"{i:02d}"
+    for point_id in scheduler.order(point_ids):
+        point_info = points.get(point_id)
         
         # 检查是否需要强制覆盖
-        output_file = CONTENT_DIR / f"{point_id}.json"
-        if output_file.exists() and not force:
-            print(f"\n[{point_id}/24] 已存在，跳过")
+        if point_info and content_path(config, point_info).exists() and not force:
+            print(f"\n[{point_id}/{total}] 已存在，跳过")
             success_count += 1
             continue
         
-        if generate_single(point_id, config):
+        if generate_single(point_id, config, budget=budget, points=points):
             success_count += 1
         else:
             fail_count += 1
     
     print(f"\n" + "=" * 50)
     print(f"生成完成: 成功 {success_count} 个, 失败 {fail_count} 个")
+    print(budget.cache_summary())
+    print(f"=" * 50)
+
+
+def enqueue_range(start_id: str, end_id: str = None, force: bool = False, priorities: dict = None):
+    """将范围内尚未生成的知识点加入任务队列，worker 按优先级和预计耗时从长到短领取"""
+    config = catalog.load_config()
+    points = catalog.point_index(config)
+    scheduler = Scheduler(config, priorities=priorities)
+    ids = [
+        point_id for point_id in catalog.range_ids(config, start_id, end_id)
+        if point_id in points and (force or not content_path(config, points[point_id]).exists())
+    ]
+    queue = WorkQueue()
+    added = queue.enqueue(
+        [(point_id, scheduler.priority(point_id), scheduler.expected_seconds(point_id)) for point_id in ids],
+        force=force,
+        missing=lambda point_id: not content_path(config, points[point_id]).exists())
+    queue.close()
+    print(f"任务队列: 新增 {added} 个任务 (范围内待生成 {len(ids)} 个)")
+
+
+def run_worker(delay: float = 1.0):
+    """从任务队列领取知识点并生成，直到队列中没有可领取的任务"""
+    config = catalog.load_config()
+    points = catalog.point_index(config)
+    total = catalog.total_count(config)
+    budget = TokenBudget()
+    queue = WorkQueue()
+    owner = default_worker_id()
+    
+    success_count = 0
+    fail_count = 0
+    
+    while True:
+        lease = queue.claim(owner)
+        if lease is None:
+            break
+        
+        point_info = points.get(lease.point_id)
+        if not point_info:
+            queue.fail(lease, "找不到知识点")
+            continue
+        
+        print(f"\n[{owner}] [{lease.point_id}/{total}] {point_info['name']} ({point_info['category']})")
+        
+        try:
+            with Heartbeat(queue.path, lease) as heartbeat:
+                data = generate_data(config, point_info, budget)
+            
+            output_file = content_path(config, point_info)
+            if heartbeat.lost or not queue.complete(lease, lambda: save_content(output_file, data)):
+                print(f"  ⚠ 租约已被其他 worker 接管，丢弃本次结果")
+                continue
+            success_count += 1
+        except Exception as e:
+            print(f"  ✗ 错误: {e}")
+            queue.fail(lease, str(e))
+            fail_count += 1
+        
+        # 延迟，避免请求过快
+        if delay > 0:
+            time.sleep(delay)
+    
+    queue.close()
+    print(f"\n[{owner}] 队列已空: 成功 {success_count} 个, 失败 {fail_count} 个")
+    print(f"[{owner}] {budget.cache_summary()}")
+
+
+def run_workers(count: int):
+    """启动多个本地 worker 进程"""
+    workers = [Process(target=run_worker) for _ in range(count)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    
+    queue = WorkQueue()
+    stats = queue.stats()
+    queue.close()
+    print(f"\n" + "=" * 50)
+    print(f"任务队列: 完成 {stats.get('done', 0)} 个, 失败 {stats.get('failed', 0)} 个, "
+          f"待处理 {stats.get('pending', 0) + stats.get('leased', 0)} 个")
     print(f"=" * 50)
 
 
 def main():
     parser = argparse.ArgumentParser(description="调用 DeepSeek API 生成语法知识点内容")
     parser.add_argument("--start", type=str, default="01", help="起始知识点 ID (默认: 01)")
-    parser.add_argument("--end", type=str, default="24", help="结束知识点 ID (默认: 24)")
+    parser.add_argument("--end", type=str, help="结束知识点 ID (默认: 最后一个知识点)")
     parser.add_argument("--single", type=str, help="生成单个知识点 (如: 05)")
     parser.add_argument("--force", action="store_true", help="强制覆盖已存在的文件")
     parser.add_argument("--list", action="store_true", help="列出所有知识点")
+    parser.add_argument("--worker", action="store_true",
+                        help="通过任务队列生成（可在多个进程或共享目录的多台机器上同时运行）")
+    parser.add_argument("--workers", type=int, default=1, help="--worker 模式下启动的本地进程数 (默认: 1)")
+    parser.add_argument("--priority", type=str, help="指定优先处理的知识点，如 08=10,16=5（数值越大越先处理）")
     
     args = parser.parse_args()
     
@@ -218,25 +344,38 @@ def main():
     
     # 列出知识点
     if args.list:
-        config = load_config()
+        config = catalog.load_config()
         print("\n知识点列表:")
-        for cat in config["categories"]:
-            print(f"\n【{cat['name']}】")
-            for point in cat["points"]:
-                status = "✓" if (CONTENT_DIR / f"{point['id']}.json").exists() else "○"
-                print(f"  {status} {point['id']}. {point['name']}")
+        category = None
+        for point in catalog.iter_points(config):
+            if point["category"] != category:
+                category = point["category"]
+                print(f"\n【{category}】")
+            status = "✓" if content_path(config, point).exists() else "○"
+            print(f"  {status} {point['id']}. {point['name']}")
         print()
         return
     
     # 生成单个
     if args.single:
-        config = load_config()
-        point_id = args.single.zfill(2)
+        config = catalog.load_config()
+        point_id = catalog.normalize_id(config, args.single)
         success = generate_single(point_id, config)
         sys.exit(0 if success else 1)
     
+    # 通过任务队列生成
+    try:
+        priorities = parse_priorities(catalog.load_config(), args.priority)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if args.worker:
+        enqueue_range(args.start, args.end, args.force, priorities)
+        run_workers(args.workers)
+        return
+    
     # 生成范围
-    generate_range(args.start, args.end, args.force)
+    generate_range(args.start, args.end, args.force, priorities)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+从模型响应中提取并修复 JSON
+Usage: uv run python scripts/json_repair.py <response.txt>
+
+一次扫描找到最外层的 JSON 对象（前后可以有说明文字或 Markdown 代码块），
+同时修复模型输出中常见的问题，避免因为格式小错误而重新调用 API:
+
+    raw-newline         字符串中的原始换行符 / 制表符
+    control-char        字符串中的其他控制字符
+    unescaped-quote     字符串中未转义的双引号（如 说明"是什么"）
+    invalid-escape      JSON 不支持的转义（如 \\'）
+    smart-quotes        用中文引号 “” 作为字符串定界符
+    trailing-comma      对象或数组末尾多余的逗号
+    mismatched-bracket  括号类型不匹配
+    unclosed-brackets   只缺少结尾的括号，补全后不丢失内容
+    truncated           输出在字符串或元素中间被截断，补全时丢失了内容
+                        （闭合未结束的字符串、悬空的键补 null 或丢弃最后一个不完整的元素）
+"""
+
+import json
+import re
+import sys
+
+REPAIR_NAMES = {
+    "raw-newline": "字符串中的原始换行符",
+    "control-char": "字符串中的控制字符",
+    "unescaped-quote": "未转义的双引号",
+    "invalid-escape": "无效的转义序列",
+    "smart-quotes": "中文引号定界符",
+    "trailing-comma": "多余的逗号",
+    "mismatched-bracket": "括号不匹配",
+    "unclosed-brackets": "缺少结尾括号",
+    "truncated": "输出被截断",
+}
+
+CLOSE = {"{": "}", "[": "]"}
+VALID_ESCAPES = set('"\\/bfnrt')
+HEX4_RE = re.compile(r'[0-9a-fA-F]{4}')
+CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+def _closes_string(text: str, pos: int) -> bool:
+    """字符串中的 " 之后若紧跟 , : } ] 或文本结尾，视为字符串结束，否则是未转义的引号"""
+    n = len(text)
+    while pos < n and text[pos] in " \t\r\n":
+        pos += 1
+    return pos >= n or text[pos] in ",:}]"
+
+
+def _last_significant(out: list) -> int:
+    """输出中最后一个非空白片段的位置"""
+    i = len(out) - 1
+    while i >= 0 and out[i].isspace():
+        i -= 1
+    return i
+
+
+def _close(out: list, stack: list) -> str:
+    """补全截断的输出：去掉末尾逗号，悬空的冒号补 null，再依次闭合括号"""
+    out = out[:]
+    i = _last_significant(out)
+    if i >= 0 and out[i] == ",":
+        del out[i:]
+    elif i >= 0 and out[i] == ":":
+        out.append("null")
+    return "".join(out) + "".join(CLOSE[b] for b in reversed(stack))
+
+
+def _scan(text: str, start: int):
+    """从 start 处的 { 开始扫描，返回 (修复后的 JSON 文本, 修复项)"""
+    out = []
+    stack = []
+    repairs = []
+    safe = None          # 最近一个完整元素之后的状态 (输出长度, 括号栈)
+    in_string = False
+    smart = False        # 当前字符串是否以中文引号开始
+    i, n = start, len(text)
+
+    def repair(name):
+        if name not in repairs:
+            repairs.append(name)
+
+    while i < n:
+        c = text[i]
+
+        if in_string:
+            if c == "\\":
+                nxt = text[i + 1] if i + 1 < n else ""
+                if nxt in VALID_ESCAPES and nxt:
+                    out.append(c + nxt)
+                    i += 2
+                elif nxt == "u" and HEX4_RE.match(text, i + 2):
+                    out.append(text[i:i + 6])
+                    i += 6
+                elif nxt == "'":
+                    repair("invalid-escape")
+                    out.append("'")
+                    i += 2
+                elif nxt:
+                    repair("invalid-escape")
+                    out.append("\\\\")
+                    i += 1
+                else:
+                    i += 1   # 截断在转义符处
+                continue
+            if smart and c == "”":
+                in_string = False
+                out.append('"')
+            elif c == '"' and not smart:
+                if _closes_string(text, i + 1):
+                    in_string = False
+                    out.append('"')
+                else:
+                    repair("unescaped-quote")
+                    out.append('\\"')
+            elif c == '"':
+                repair("unescaped-quote")
+                out.append('\\"')
+            elif c in CONTROL_ESCAPES:
+                repair("raw-newline")
+                out.append(CONTROL_ESCAPES[c])
+            elif c < " ":
+                repair("control-char")
+                out.append(f"\\u{ord(c):04x}")
+            else:
+                out.append(c)
+            i += 1
+            continue
+
+        if c == '"':
+            in_string, smart = True, False
+            out.append(c)
+        elif c in "“”":
+            repair("smart-quotes")
+            in_string, smart = True, True
+            out.append('"')
+        elif c in "{[":
+            stack.append(c)
+            out.append(c)
+        elif c in "}]":
+            last = _last_significant(out)
+            if last >= 0 and out[last] == ",":
+                repair("trailing-comma")
+                del out[last]
+            expected = CLOSE[stack.pop()]
+            if c != expected:
+                repair("mismatched-bracket")
+            out.append(expected)
+            if not stack:
+                return "".join(out), repairs
+        elif c == ",":
+            safe = (len(out), stack[:])
+            out.append(c)
+        else:
+            out.append(c)
+        i += 1
+
+    # 文本结束但对象未闭合。最后一个值已经完整（以 " } ] 结尾）时只需补全括号，
+    # 否则（字符串未结束、末尾是逗号、冒号、数字等）说明还有内容没有输出
+    last = _last_significant(out)
+    if not in_string and last >= 0 and out[last] in ('"', "}", "]"):
+        candidate = _close(out, stack)
+        try:
+            json.loads(candidate)
+            repair("unclosed-brackets")
+            return candidate, repairs
+        except json.JSONDecodeError:
+            pass
+
+    repair("truncated")
+    if in_string:
+        out.append('"')
+    candidate = _close(out, stack)
+    try:
+        json.loads(candidate)
+        return candidate, repairs
+    except json.JSONDecodeError:
+        pass
+    if safe is None:
+        return candidate, repairs
+    # 丢弃最后一个不完整的元素
+    length, safe_stack = safe
+    return _close(out[:length], safe_stack), repairs
+
+
+def extract_json(content: str):
+    """从 API 响应中提取 JSON 对象，返回 (数据, 修复项列表)"""
+    # 绝大多数响应本身就是合法 JSON，直接解析
+    try:
+        data = json.loads(content)
+        if isinstance(data, dict):
+            return data, []
+    except json.JSONDecodeError:
+        pass
+
+    # 依次尝试每个 {，通常第一个就是 JSON 的开始
+    start = content.find("{")
+    while start != -1:
+        candidate, repairs = _scan(content, start)
+        try:
+            data = json.loads(candidate)
+            if isinstance(data, dict):
+                return data, repairs
+        except json.JSONDecodeError:
+            pass
+        start = content.find("{", start + 1)
+
+    raise ValueError("无法从响应中提取有效的 JSON")
+
+
+def describe(repairs: list) -> str:
+    """修复项的中文说明"""
+    return "、".join(REPAIR_NAMES.get(r, r) for r in repairs)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/json_repair.py <response.txt>")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        data, repairs = extract_json(f.read())
+
+    if repairs:
+        print(f"已修复: {describe(repairs)}", file=sys.stderr)
+    print(json.dumps(data, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+多格式输出：HTML 页面、Markdown 笔记、EPUB 电子书
+每个内容文件只解析一次（见 content_model.py），解析结果依次交给各个输出器
+
+输出器接口:
+    output_for(rel)     内容文件（相对 content/ 的路径）对应的输出路径，用于判断是否需要重新生成
+    aggregate           为 True 时输出依赖全部知识点（如 EPUB）
+    emit(point)         处理单个知识点
+    finish()            全部知识点处理完后调用（如打包 EPUB）
+"""
+
+import html
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import build_html
+import catalog
+from content_model import GrammarPoint
+
+# 路径配置
+NOTES_DIR = Path("notes")
+EPUB_PATH = Path("dist/english_grammar.epub")
+CSS_PATH = Path("docs/assets/css/style.css")
+
+BOOK_TITLE = "英语语法精讲"
+
+
+class HtmlEmitter:
+    """生成 docs/NN.html 与 docs/answers/NN.json"""
+
+    aggregate = False
+
+    def __init__(self):
+        self.template = build_html.load_template()
+        self.config = catalog.load_config()
+        self.all_points = list(catalog.iter_points(self.config))
+
+    def output_for(self, rel: Path) -> Path:
+        return build_html.OUTPUT_DIR / rel.with_suffix(".html")
+
+    def emit(self, point: GrammarPoint):
+        page = build_html.build_html(point, self.template, self.config, self.all_points)
+        meta = build_html.point_meta(self.config, point.index, self.all_points)
+        build_html.save_html(self.config, meta, page)
+        build_html.save_answers(self.config, meta, build_html.build_answers(point))
+
+    def finish(self):
+        pass
+
+
+def render_markdown(point: GrammarPoint) -> str:
+    """将知识点渲染为 Markdown 笔记"""
+    lines = [f"# {point.index}. {point.grammar_point}", ""]
+    if point.name_en:
+        lines += [f"*{point.name_en}*", ""]
+    lines += [f"> 分类：{point.category}", ""]
+
+    lines += ["## 它能做什么？", "", point.overview_function, ""]
+    lines += [f"- {s}" for s in point.usage_scenarios] + [""]
+
+    lines += ["## 核心语法规则", "", point.rules_description, ""]
+    for i, p in enumerate(point.key_points, 1):
+        lines += [f"### {i}. {p.point}", "", p.explanation, ""]
+
+    lines += ["## 典型案例", ""]
+    for ex in point.examples:
+        lines += [f"- **{ex.sentence}**", f"  - {ex.translation}", f"  - {ex.analysis}"]
+    lines.append("")
+
+    lines += ["## 练习巩固", "", "### 选择题", ""]
+    for i, q in enumerate(point.multiple_choice, 1):
+        lines.append(f"{i}. {q.question}")
+        lines += [f"   - {opt}" for opt in q.options]
+    lines += ["", "### 填空与改写", ""]
+    lines += [f"{i}. {q.question}" for i, q in enumerate(point.fill_blank, 1)]
+    lines.append("")
+
+    lines += ["<details>", "<summary>答案解析</summary>", ""]
+    for name, questions in (("选择题", point.multiple_choice), ("填空与改写", point.fill_blank)):
+        lines += [f"**{name}**", ""]
+        lines += [f"{i}. 答案：{q.answer} - {q.explanation}" for i, q in enumerate(questions, 1)]
+        lines.append("")
+    lines += ["</details>", ""]
+
+    lines += ["## 一句话总结", "", f"> {point.summary}", ""]
+    lines += ["## 相关知识点", "", "、".join(point.related_points), ""]
+    return "\n".join(lines)
+
+
+class MarkdownEmitter:
+    """生成 notes/NN.md 以及目录 notes/README.md"""
+
+    aggregate = False
+
+    def __init__(self):
+        self.config = catalog.load_config()
+        self.all_points = list(catalog.iter_points(self.config))
+        self.emitted = 0
+
+    def output_for(self, rel: Path) -> Path:
+        return NOTES_DIR / rel.with_suffix(".md")
+
+    def emit(self, point: GrammarPoint):
+        meta = build_html.point_meta(self.config, point.index, self.all_points)
+        output_path = catalog.point_path(self.config, NOTES_DIR, meta, ".md")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(render_markdown(point))
+        self.emitted += 1
+        print(f"Markdown 笔记已保存到: {output_path}")
+
+    def finish(self):
+        if not self.emitted:
+            return
+        # 目录按配置生成，增量构建时未重新生成的笔记也会列出
+        lines = [f"# {BOOK_TITLE} - 笔记目录"]
+        category = None
+        for p in self.all_points:
+            rel = catalog.point_path(self.config, Path(), p, ".md")
+            if not (NOTES_DIR / rel).exists():
+                continue
+            if p["category"] != category:
+                category = p["category"]
+                lines += ["", f"## {category}", ""]
+            lines.append(f"- {p['id']}. [{p['name']}]({rel.as_posix()})")
+        output_path = NOTES_DIR / "README.md"
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"笔记目录已保存到: {output_path}")
+
+
+def xhtml_page(title: str, body: str) -> str:
+    """包装为 EPUB 所需的 XHTML 文档"""
+    return f'''<?xml version="1.0" encoding="utf-8"?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="zh-CN" xml:lang="zh-CN">
+<head>
+<meta charset="utf-8"/>
+<title>{html.escape(title)}</title>
+<link rel="stylesheet" type="text/css" href="style.css"/>
+</head>
+<body>
+{body}
+</body>
+</html>
+'''
+
+
+def render_chapter(point: GrammarPoint) -> str:
+    """将知识点渲染为 EPUB 章节（XHTML，答案放在章节末尾）"""
+    e = html.escape
+    parts = [f"<h1>{point.index}. {e(point.grammar_point)}</h1>"]
+    if point.name_en:
+        parts.append(f'<p class="subtitle">{e(point.name_en)}</p>')
+
+    parts.append("<h2>它能做什么？</h2>")
+    parts.append(f"<p>{e(point.overview_function)}</p>")
+    parts.append("<ul>" + "".join(f"<li>{e(s)}</li>" for s in point.usage_scenarios) + "</ul>")
+
+    parts.append("<h2>核心语法规则</h2>")
+    parts.append(f"<p>{e(point.rules_description)}</p>")
+    for i, p in enumerate(point.key_points, 1):
+        parts.append(f"<h3>{i}. {e(p.point)}</h3><p>{e(p.explanation)}</p>")
+
+    parts.append("<h2>典型案例</h2>")
+    for ex in point.examples:
+        parts.append(f'<div class="example-item"><p class="sentence">{e(ex.sentence)}</p>'
+                     f'<p class="translation">{e(ex.translation)}</p><p class="analysis">{e(ex.analysis)}</p></div>')
+
+    parts.append("<h2>练习巩固</h2><h3>选择题</h3><ol>")
+    for q in point.multiple_choice:
+        options = "".join(f"<li>{e(opt)}</li>" for opt in q.options)
+        parts.append(f'<li>{e(q.question)}<ul class="options">{options}</ul></li>')
+    parts.append("</ol><h3>填空与改写</h3><ol>")
+    parts += [f"<li>{e(q.question)}</li>" for q in point.fill_blank]
+    parts.append("</ol>")
+
+    parts.append("<h2>一句话总结</h2>")
+    parts.append(f"<blockquote>{e(point.summary)}</blockquote>")
+    parts.append(f"<p>相关知识点：{e('、'.join(point.related_points))}</p>")
+
+    parts.append('<section class="answers"><h2>答案解析</h2>')
+    for name, questions in (("选择题", point.multiple_choice), ("填空与改写", point.fill_blank)):
+        parts.append(f"<h3>{name}</h3>")
+        parts += [f"<p><strong>{i}.</strong> 答案：{e(q.answer)} - {e(q.explanation)}</p>"
+                  for i, q in enumerate(questions, 1)]
+    parts.append("</section>")
+
+    return xhtml_page(point.grammar_point, "\n".join(parts))
+
+
+class EpubEmitter:
+    """将全部知识点打包为单个 EPUB 文件"""
+
+    aggregate = True  # 任一章节变化都需要全部知识点重新打包
+
+    def __init__(self, path: Path = EPUB_PATH):
+        self.path = path
+        self.chapters = []
+        self.width = catalog.id_width(catalog.load_config())
+
+    def output_for(self, rel: Path) -> Path:
+        return self.path
+
+    def chapter_id(self, point: GrammarPoint) -> str:
+        return str(point.index).zfill(self.width)
+
+    def emit(self, point: GrammarPoint):
+        self.chapters.append((point, render_chapter(point)))
+
+    def build_nav(self, points: list) -> str:
+        items = "\n".join(
+            f'<li><a href="{self.chapter_id(p)}.xhtml">{p.index}. {html.escape(p.grammar_point)}</a></li>'
+            for p in points
+        )
+        body = f'<nav epub:type="toc" id="toc"><h1>目录</h1><ol>\n{items}\n</ol></nav>'
+        return xhtml_page("目录", body)
+
+    def build_opf(self, points: list) -> str:
+        modified = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        book_id = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/ciceroxiao/english-grammar-notes")
+        manifest = ['<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>',
+                    '<item id="css" href="style.css" media-type="text/css"/>']
+        spine = ['<itemref idref="nav"/>']
+        for p in points:
+            item_id = f"p{self.chapter_id(p)}"
+            manifest.append(f'<item id="{item_id}" href="{self.chapter_id(p)}.xhtml" '
+                            f'media-type="application/xhtml+xml"/>')
+            spine.append(f'<itemref idref="{item_id}"/>')
+        return f'''<?xml version="1.0" encoding="utf-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id" xml:lang="zh-CN">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:identifier id="book-id">urn:uuid:{book_id}</dc:identifier>
+    <dc:title>{BOOK_TITLE}</dc:title>
+    <dc:language>zh-CN</dc:language>
+    <meta property="dcterms:modified">{modified}</meta>
+  </metadata>
+  <manifest>
+    {(chr(10) + "    ").join(manifest)}
+  </manifest>
+  <spine>
+    {(chr(10) + "    ").join(spine)}
+  </spine>
+</package>
+'''
+
+    def finish(self):
+        if not self.chapters:
+            return
+        self.chapters.sort(key=lambda c: c[0].index)
+        points = [point for point, _ in self.chapters]
+        container = '''<?xml version="1.0" encoding="utf-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>
+'''
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(self.path, 'w') as zf:
+            # mimetype 必须是第一个文件且不压缩
+            zf.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+            zf.writestr("META-INF/container.xml", container, compress_type=zipfile.ZIP_DEFLATED)
+            zf.writestr("OEBPS/content.opf", self.build_opf(points), compress_type=zipfile.ZIP_DEFLATED)
+            zf.writestr("OEBPS/nav.xhtml", self.build_nav(points), compress_type=zipfile.ZIP_DEFLATED)
+            zf.writestr("OEBPS/style.css", CSS_PATH.read_text(encoding='utf-8'), compress_type=zipfile.ZIP_DEFLATED)
+            for point, chapter in self.chapters:
+                zf.writestr(f"OEBPS/{self.chapter_id(point)}.xhtml", chapter,
+                            compress_type=zipfile.ZIP_DEFLATED)
+        print(f"EPUB 已保存到: {self.path} ({len(self.chapters)} 章)")
+
+
+EMITTERS = {
+    "html": HtmlEmitter,
+    "md": MarkdownEmitter,
+    "epub": EpubEmitter,
+}
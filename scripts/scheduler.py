@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+按预计耗时安排知识点的生成顺序（最长任务优先）
+Usage: uv run python scripts/scheduler.py [--start 01] [--end N] [--priority 08=10,16=5]
+
+并行生成时，若耗时长的知识点（如动词时态、各类子句）排在最后，整批任务的完成时间
+就由它们决定。这里根据 stats/token_usage.json 中的历史耗时估算每个知识点的生成时间，
+先按用户指定的优先级、再按预计耗时从长到短排序。
+
+优先级来源（数值越大越先处理，默认 0）:
+- config/grammar_points.json 中知识点的 "priority" 字段
+- 命令行 --priority 参数（覆盖配置）
+"""
+
+import argparse
+import heapq
+import statistics
+
+import catalog
+from token_budget import TokenBudget
+
+# 没有任何历史数据时的默认预计耗时（秒）
+DEFAULT_SECONDS = 60.0
+
+
+def parse_priorities(config, text: str) -> dict:
+    """解析 "08=10,16=5" 形式的优先级参数，格式错误时抛出 ValueError"""
+    priorities = {}
+    if not text:
+        return priorities
+    for item in text.split(","):
+        point_id, _, value = item.partition("=")
+        try:
+            priorities[catalog.normalize_id(config, point_id.strip())] = int(value or 1)
+        except ValueError:
+            raise ValueError(f"无效的优先级: {item.strip()}（格式如 08=10,16=5）") from None
+    return priorities
+
+
+class Scheduler:
+    """根据历史耗时估算生成时间并给出调度顺序"""
+
+    def __init__(self, config: dict, budget: TokenBudget = None, priorities: dict = None):
+        self.config = config
+        self.points = catalog.point_index(config)
+        self.budget = budget or TokenBudget()
+        self.priorities = {}
+        for cat in config["categories"]:
+            for point in cat["points"]:
+                if "priority" in point:
+                    self.priorities[point["id"]] = int(point["priority"])
+        self.priorities.update(priorities or {})
+
+        usages = [u for history in self.budget.data["points"].values() for u in history]
+        self.default_seconds = self._median_latency(usages) or DEFAULT_SECONDS
+
+    @staticmethod
+    def _median_latency(history: list) -> float:
+        latencies = [u["latency"] for u in history if "latency" in u]
+        return statistics.median(latencies) if latencies else None
+
+    def expected_seconds(self, point_id: str) -> float:
+        """预计耗时：优先使用知识点自身的历史，其次同分类，最后全局中位数"""
+        point = self.points.get(point_id)
+        category = point["category"] if point else ""
+        for history in (self.budget.data["points"].get(point_id, []),
+                        self.budget.data["categories"].get(category, [])):
+            seconds = self._median_latency(history)
+            if seconds is not None:
+                return seconds
+        return self.default_seconds
+
+    def priority(self, point_id: str) -> int:
+        return self.priorities.get(point_id, 0)
+
+    def order(self, point_ids) -> list:
+        """按 (优先级, 预计耗时) 从高到低排序，同等条件下按 ID 顺序"""
+        heap = [(-self.priority(p), -self.expected_seconds(p), p) for p in point_ids]
+        heapq.heapify(heap)
+        return [heapq.heappop(heap)[2] for _ in range(len(heap))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="查看知识点生成顺序与预计耗时")
+    parser.add_argument("--start", type=str, default="01", help="起始知识点 ID (默认: 01)")
+    parser.add_argument("--end", type=str, help="结束知识点 ID (默认: 最后一个知识点)")
+    parser.add_argument("--priority", type=str, help="指定优先级，如 08=10,16=5")
+
+    args = parser.parse_args()
+
+    config = catalog.load_config()
+    try:
+        priorities = parse_priorities(config, args.priority)
+    except ValueError as e:
+        parser.error(str(e))
+
+    scheduler = Scheduler(config, priorities=priorities)
+    for point_id in scheduler.order(catalog.range_ids(config, args.start, args.end)):
+        point = scheduler.points.get(point_id, {"name": "?"})
+        print(f"[{point_id}] 优先级 {scheduler.priority(point_id):3d}  "
+              f"预计 {scheduler.expected_seconds(point_id):6.1f}s  {point['name']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+根据历史用量为每次 API 调用估算 max_tokens
+Usage: uv run python scripts/token_budget.py [--point 08]
+
+每次调用结束后记录 prompt / completion token 数（按知识点和分类分别统计），
+下次调用时取历史用量的高分位值并加上余量作为 max_tokens；
+若响应因长度被截断（finish_reason == "length"），则按倍数放大预算后重试。
+"""
+
+import argparse
+import json
+import math
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows 上没有 fcntl，只能单进程生成
+    fcntl = None
+
+import catalog
+
+# 路径配置
+USAGE_PATH = Path("stats/token_usage.json")
+
+# 预算参数
+DEFAULT_MAX_TOKENS = 4000   # 没有历史数据时的默认值
+MIN_MAX_TOKENS = 1024
+MAX_MAX_TOKENS = 8192       # deepseek-chat 单次输出上限
+HEADROOM = 1.25             # 在历史高分位值之上预留的余量
+PERCENTILE = 0.95
+RETRY_GROWTH = 1.5          # 截断后重试时的放大倍数
+HISTORY_LIMIT = 50          # 每个知识点 / 分类最多保留的记录数
+
+
+def percentile(values: list, q: float) -> float:
+    """计算分位数（最近秩法）"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+class TokenBudget:
+    """记录历史 token 用量并给出每次请求的 max_tokens"""
+
+    def __init__(self, path: Path = USAGE_PATH):
+        self.path = path
+        self.data = self.load()
+        # 本次运行的上下文缓存统计
+        self.cache_hit_tokens = 0
+        self.cache_miss_tokens = 0
+
+    def load(self) -> dict:
+        """读取用量记录"""
+        if not self.path.exists():
+            return {"points": {}, "categories": {}}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self):
+        """保存用量记录（先写临时文件再替换，多个 worker 同时写入时不会产生损坏的文件）"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @contextmanager
+    def _locked(self):
+        """对用量记录加排他锁（锁文件与记录文件同目录），多个 worker 依次读-改-写"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(f"{self.path.name}.lock"), 'w') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def record(self, point_id: str, category: str, usage: dict):
+        """记录一次调用的用量
+
+        usage 至少包含 prompt_tokens、completion_tokens、finish_reason。
+        被截断的调用只说明实际需求大于当时的预算，同样记录下来，
+        估算时会把它当作下限参与计算。
+        """
+        self.cache_hit_tokens += usage.get("prompt_cache_hit_tokens", 0)
+        self.cache_miss_tokens += usage.get("prompt_cache_miss_tokens", 0)
+
+        # 在锁内重新读取再写入，不会覆盖其他 worker 同时写入的记录
+        with self._locked():
+            self.data = self.load()
+            for key, name in (("points", point_id), ("categories", category)):
+                history = self.data[key].setdefault(name, [])
+                history.append(usage)
+                del history[:-HISTORY_LIMIT]
+            self.save()
+
+    def history(self, point_id: str, category: str) -> list:
+        """优先使用知识点自身的历史，其次使用同分类的历史"""
+        return (self.data["points"].get(point_id)
+                or self.data["categories"].get(category)
+                or [])
+
+    def suggest_max_tokens(self, point_id: str, category: str) -> int:
+        """根据历史分布估算 max_tokens"""
+        history = self.history(point_id, category)
+        if not history:
+            return DEFAULT_MAX_TOKENS
+
+        observed = []
+        for usage in history:
+            tokens = usage["completion_tokens"]
+            if usage.get("finish_reason") == "length":
+                tokens = math.ceil(tokens * RETRY_GROWTH)
+            observed.append(tokens)
+
+        budget = math.ceil(percentile(observed, PERCENTILE) * HEADROOM)
+        return max(MIN_MAX_TOKENS, min(MAX_MAX_TOKENS, budget))
+
+    def cache_summary(self) -> str:
+        """本次运行的上下文缓存命中情况"""
+        total = self.cache_hit_tokens + self.cache_miss_tokens
+        rate = self.cache_hit_tokens / total * 100 if total else 0
+        return (f"上下文缓存: 命中 {self.cache_hit_tokens} tokens, "
+                f"未命中 {self.cache_miss_tokens} tokens (命中率 {rate:.1f}%)")
+
+    @staticmethod
+    def grow(max_tokens: int) -> int:
+        """截断后重试使用的新预算，已达上限时返回 None"""
+        if max_tokens >= MAX_MAX_TOKENS:
+            return None
+        return min(MAX_MAX_TOKENS, math.ceil(max_tokens * RETRY_GROWTH))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="查看历史 token 用量与预算估算")
+    parser.add_argument("--point", type=str, help="只显示指定知识点 (如: 08)")
+
+    args = parser.parse_args()
+
+    budget = TokenBudget()
+    points = budget.data["points"]
+    if not points:
+        print("暂无用量记录，请先运行 generate_content.py")
+        return
+
+    only = catalog.normalize_id(catalog.load_config(), args.point) if args.point else None
+    for point_id in sorted(points):
+        if only and point_id != only:
+            continue
+        history = points[point_id]
+        category = history[-1].get("category", "")
+        completions = [u["completion_tokens"] for u in history]
+        print(f"[{point_id}] 调用 {len(history)} 次, "
+              f"completion 最大 {max(completions)}, "
+              f"建议 max_tokens={budget.suggest_max_tokens(point_id, category)}")
+
+
+if __name__ == "__main__":
+    main()
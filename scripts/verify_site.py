@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+检查构建后的站点：页面链接、锚点和静态资源
+Usage: uv run python scripts/verify_site.py [--output report.json] [--jobs 8]
+
+并行解析 docs/ 下的每个页面（每个页面只解析一次），汇总所有文件和锚点（id），
+再逐一检查站内引用（href、src、data-answers）。结果以 JSON 输出，存在问题时退出码为 1。
+
+检查的问题类型:
+    missing-file    引用的文件不存在
+    missing-anchor  目标页面中没有对应 id
+    empty-anchor    空锚点（如 href="#"、index.html#）
+    outside-site    路径超出 docs/ 目录
+"""
+
+import argparse
+import html
+import json
+import os
+import posixpath
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+DOCS_DIR = Path("docs")
+
+# 需要检查的属性
+REF_ATTRS = {"href", "src", "data-answers"}
+
+# 外部链接在检查缓存中的标记
+EXTERNAL = object()
+
+# 只提取开始标签及其属性，比完整的 HTMLParser 快一个数量级，页面数量很大时差别明显
+TAG_RE = re.compile(r'<([a-zA-Z][\w-]*)(\s[^<>]*)?>')
+ATTR_RE = re.compile(r'([^\s"\'<>/=]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'=<>`]+))')
+
+
+def parse_page(rel: str):
+    """解析单个页面，返回 (页面, id 集合, 站内引用列表)（在子进程中运行）"""
+    with open(DOCS_DIR / rel, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    ids = set()
+    refs = []
+    line, line_pos = 1, 0
+    for tag in TAG_RE.finditer(text):
+        attrs = tag.group(2)
+        if not attrs or "=" not in attrs:
+            continue
+        name = tag.group(1).lower()
+        for attr in ATTR_RE.finditer(attrs):
+            key = attr.group(1).lower()
+            if key == "id" or (key == "name" and name == "a"):
+                ids.add(html.unescape(attr.group(attr.lastindex)))
+            elif key in REF_ATTRS:
+                # 行号只在需要时增量计算
+                line += text.count("\n", line_pos, tag.start())
+                line_pos = tag.start()
+                refs.append((line, name, key, html.unescape(attr.group(attr.lastindex))))
+    return rel, ids, refs
+
+
+def iter_files(base: Path, prefix: str = ""):
+    """遍历 docs/ 下所有文件，返回相对路径（posix 格式）"""
+    with os.scandir(base) as entries:
+        for entry in entries:
+            rel = f"{prefix}{entry.name}"
+            if entry.is_dir():
+                yield from iter_files(Path(entry.path), f"{rel}/")
+            else:
+                yield rel
+
+
+def is_external(url: str) -> bool:
+    """外部链接（含协议或以 // 开头）不检查"""
+    parts = urlsplit(url)
+    return bool(parts.scheme) or url.startswith("//")
+
+
+def check_ref(page: str, url: str, files: set, anchors: dict):
+    """检查单个引用，返回 (问题类型, 解析后的目标) 或 None"""
+    parts = urlsplit(url)
+    path = unquote(parts.path)
+
+    if path:
+        target = posixpath.normpath(posixpath.join(posixpath.dirname(page), path))
+        if path.endswith("/") or target == ".":
+            target = posixpath.join(target, "index.html") if target != "." else "index.html"
+        if target == ".." or target.startswith("../"):
+            return "outside-site", target
+        if target not in files:
+            return "missing-file", target
+    else:
+        target = page
+
+    if "#" in url:
+        if not parts.fragment:
+            return "empty-anchor", target
+        if target.endswith(".html") and unquote(parts.fragment) not in anchors.get(target, ()):
+            return "missing-anchor", f"{target}#{parts.fragment}"
+    return None
+
+
+def verify(jobs: int = None) -> dict:
+    """检查整个站点，返回报告"""
+    files = set(iter_files(DOCS_DIR))
+    pages = [f for f in files if f.endswith(".html")]
+
+    anchors = {}
+    refs = {}
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        results = map(parse_page, pages)
+    else:
+        pool = ProcessPoolExecutor(max_workers=jobs)
+        results = pool.map(parse_page, pages, chunksize=max(1, len(pages) // (jobs * 4)))
+    for rel, ids, page_refs in results:
+        anchors[rel] = ids
+        refs[rel] = page_refs
+    if jobs > 1:
+        pool.shutdown()
+
+    broken = []
+    ref_count = 0
+    # 同一目录下的相同引用（样式、脚本、导航等）结果相同，只检查一次
+    checked = {}
+    for page in sorted(refs):
+        base = posixpath.dirname(page)
+        for line, tag, attr, url in refs[page]:
+            key = (page, url) if url.startswith("#") else (base, url)
+            if key not in checked:
+                checked[key] = EXTERNAL if is_external(url) else check_ref(page, url, files, anchors)
+            problem = checked[key]
+            if problem is EXTERNAL:
+                continue
+            ref_count += 1
+            if problem:
+                reason, target = problem
+                broken.append({
+                    "page": page,
+                    "line": line,
+                    "tag": tag,
+                    "attr": attr,
+                    "url": url,
+                    "target": target,
+                    "reason": reason,
+                })
+
+    return {
+        "pages": len(pages),
+        "files": len(files),
+        "references": ref_count,
+        "broken": broken,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="检查构建后站点的链接、锚点和资源")
+    parser.add_argument("--output", type=str, help="将 JSON 报告写入文件（默认输出到标准输出）")
+    parser.add_argument("--jobs", type=int, help="并行进程数 (默认: CPU 核数)")
+
+    args = parser.parse_args()
+
+    report = verify(args.jobs)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        print(f"检查 {report['pages']} 个页面、{report['references']} 个站内引用，"
+              f"发现 {len(report['broken'])} 个问题，报告已保存到: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    sys.exit(1 if report["broken"] else 0)
+
+
+if __name__ == "__main__":
+    main()
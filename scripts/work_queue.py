@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+基于 SQLite 的知识点生成任务队列（租约 + 心跳）
+Usage: uv run python scripts/work_queue.py [--reset-failed]
+
+多个 generate_content.py --worker 进程（或共享同一目录的多台机器）从队列中领取知识点：
+- 按优先级、预计耗时从高到低领取（见 scheduler.py），耗时长的知识点先开始
+- 领取时获得租约（lease），租约在 LEASE_SECONDS 后过期
+- 生成期间后台线程定时心跳，延长租约
+- 进程崩溃或失联后租约过期，任务会被其他 worker 重新领取
+- 提交结果时在数据库写锁内校验租约，只有仍持有租约的 worker 能写入内容文件，
+  保证每个知识点只被提交一次
+
+数据库使用默认的回滚日志模式（不使用 WAL），以便放在网络共享目录上使用。
+"""
+
+import argparse
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+# 路径配置
+QUEUE_PATH = Path("stats/work_queue.db")
+
+# 租约参数
+LEASE_SECONDS = 300        # 租约有效期
+HEARTBEAT_SECONDS = 60     # 心跳间隔，应明显小于租约有效期
+MAX_ATTEMPTS = 3           # 超过次数后标记为失败
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    point_id      TEXT PRIMARY KEY,
+    status        TEXT NOT NULL DEFAULT 'pending',  -- pending / leased / done / failed
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    lease_owner   TEXT,
+    lease_token   TEXT,
+    lease_expires REAL,
+    error         TEXT,
+    updated_at    REAL NOT NULL,
+    priority      INTEGER NOT NULL DEFAULT 0,
+    expected_seconds REAL NOT NULL DEFAULT 0
+)
+"""
+
+# 旧版本队列数据库缺少的列
+MIGRATIONS = {
+    "priority": "ALTER TABLE tasks ADD COLUMN priority INTEGER NOT NULL DEFAULT 0",
+    "expected_seconds": "ALTER TABLE tasks ADD COLUMN expected_seconds REAL NOT NULL DEFAULT 0",
+}
+
+
+def default_worker_id() -> str:
+    """worker 标识：主机名 + 进程号"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class Lease:
+    point_id: str
+    token: str
+    owner: str
+
+
+class WorkQueue:
+    """知识点生成任务队列"""
+
+    def __init__(self, path: Path = QUEUE_PATH):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None：由代码显式控制事务（BEGIN IMMEDIATE 立即获取写锁）
+        self.conn = sqlite3.connect(str(path), timeout=30, isolation_level=None)
+        self.conn.execute(SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(tasks)")}
+        for column, sql in MIGRATIONS.items():
+            if column not in columns:
+                self.conn.execute(sql)
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, tasks, force: bool = False, missing=None) -> int:
+        """加入需要生成的任务 [(point_id, priority, expected_seconds), ...]
+
+        已存在的待处理或失败任务重置为待处理；正在处理中的任务只更新优先级和预计耗时。
+        已完成的任务只在 force 时，或 missing(point_id) 在写锁内确认内容文件仍不存在时
+        （如内容被删除）才重新处理。complete() 在同一把写锁内写入内容文件，
+        因此其他 worker 刚完成的任务不会被重复生成。
+        """
+        now = time.time()
+        added = 0
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for point_id, priority, expected_seconds in tasks:
+                cur = self.conn.execute(
+                    "INSERT OR IGNORE INTO tasks (point_id, updated_at, priority, expected_seconds) "
+                    "VALUES (?, ?, ?, ?)",
+                    (point_id, now, priority, expected_seconds))
+                added += cur.rowcount
+                if cur.rowcount:
+                    continue
+                self.conn.execute(
+                    "UPDATE tasks SET priority = ?, expected_seconds = ? WHERE point_id = ?",
+                    (priority, expected_seconds, point_id))
+                status = self.conn.execute(
+                    "SELECT status FROM tasks WHERE point_id = ?", (point_id,)).fetchone()[0]
+                if status == "leased":
+                    continue
+                if status == "done" and not (force or (missing and missing(point_id))):
+                    continue
+                self.conn.execute(
+                    "UPDATE tasks SET status = 'pending', attempts = 0, error = NULL, updated_at = ? "
+                    "WHERE point_id = ?",
+                    (now, point_id))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def claim(self, owner: str) -> Lease:
+        """领取一个待处理或租约已过期的任务，没有可领取的任务时返回 None"""
+        now = time.time()
+        token = uuid.uuid4().hex
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 多次领取后仍未完成（租约过期）的任务标记为失败
+            self.conn.execute(
+                "UPDATE tasks SET status = 'failed', error = '租约过期', updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, MAX_ATTEMPTS))
+            row = self.conn.execute(
+                "SELECT point_id FROM tasks "
+                "WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?)) "
+                "AND attempts < ? ORDER BY priority DESC, expected_seconds DESC, point_id LIMIT 1",
+                (now, MAX_ATTEMPTS)).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            self.conn.execute(
+                "UPDATE tasks SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                "lease_token = ?, lease_expires = ?, updated_at = ? WHERE point_id = ?",
+                (owner, token, now + LEASE_SECONDS, now, row[0]))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return Lease(row[0], token, owner)
+
+    def heartbeat(self, lease: Lease) -> bool:
+        """延长租约，租约已被他人接管时返回 False"""
+        now = time.time()
+        cur = self.conn.execute(
+            "UPDATE tasks SET lease_expires = ?, updated_at = ? "
+            "WHERE point_id = ? AND lease_token = ? AND status = 'leased'",
+            (now + LEASE_SECONDS, now, lease.point_id, lease.token))
+        return cur.rowcount == 1
+
+    def complete(self, lease: Lease, commit) -> bool:
+        """在持有写锁且租约有效时执行 commit()（写入结果文件）并标记完成
+
+        租约已被其他 worker 接管时不执行 commit，返回 False。
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                "SELECT 1 FROM tasks WHERE point_id = ? AND lease_token = ? AND status = 'leased'",
+                (lease.point_id, lease.token)).fetchone()
+            if row is None:
+                self.conn.execute("ROLLBACK")
+                return False
+            commit()
+            self.conn.execute(
+                "UPDATE tasks SET status = 'done', lease_token = NULL, lease_expires = NULL, "
+                "error = NULL, updated_at = ? WHERE point_id = ?",
+                (time.time(), lease.point_id))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def fail(self, lease: Lease, error: str):
+        """释放租约；未超过重试次数的任务回到待处理状态"""
+        self.conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "lease_token = NULL, lease_expires = NULL, error = ?, updated_at = ? "
+            "WHERE point_id = ? AND lease_token = ?",
+            (MAX_ATTEMPTS, error, time.time(), lease.point_id, lease.token))
+
+    def reset_failed(self) -> int:
+        """将失败的任务重置为待处理"""
+        cur = self.conn.execute(
+            "UPDATE tasks SET status = 'pending', attempts = 0, updated_at = ? WHERE status = 'failed'",
+            (time.time(),))
+        return cur.rowcount
+
+    def stats(self) -> dict:
+        """各状态的任务数"""
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        return dict(rows)
+
+
+class Heartbeat:
+    """在后台线程中定时延长租约
+
+    with Heartbeat(queue.path, lease) as hb:
+        ...
+        if hb.lost: 租约已被接管
+    """
+
+    def __init__(self, path: Path, lease: Lease, interval: float = HEARTBEAT_SECONDS):
+        self.path = path
+        self.lease = lease
+        self.interval = interval
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        # SQLite 连接不能跨线程共享，心跳线程使用独立连接
+        queue = WorkQueue(self.path)
+        try:
+            while not self._stop.wait(self.interval):
+                if not queue.heartbeat(self.lease):
+                    self.lost = True
+                    return
+        finally:
+            queue.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="查看知识点生成任务队列")
+    parser.add_argument("--reset-failed", action="store_true", help="将失败的任务重置为待处理")
+
+    args = parser.parse_args()
+
+    if not QUEUE_PATH.exists():
+        print("任务队列不存在，请先运行 generate_content.py --worker")
+        return
+
+    queue = WorkQueue()
+    if args.reset_failed:
+        print(f"已重置 {queue.reset_failed()} 个失败任务")
+
+    stats = queue.stats()
+    print("任务队列状态:")
+    for status in ("pending", "leased", "done", "failed"):
+        print(f"  {status:8s} {stats.get(status, 0)}")
+
+    for point_id, owner, error in queue.conn.execute(
+            "SELECT point_id, lease_owner, error FROM tasks WHERE status = 'failed' ORDER BY point_id"):
+        print(f"  ✗ [{point_id}] ({owner}) {error}")
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+// 英语语法精讲 - 离线缓存 Service Worker（由 scripts/build_sw.py 生成，请勿手动修改 docs/sw.js）
+
+const BUILD_VERSION = '{{BUILD_VERSION}}';
+const MANIFEST_URL = 'precache-manifest.json';
+const CACHE_NAME = 'grammar-precache';
+
+// 每个资源以 "url?__rev=<hash>" 为键缓存，内容未变的资源在新版本中直接复用
+function cacheKey(entry) {
+    return new URL(entry.url + '?__rev=' + entry.revision, self.registration.scope).href;
+}
+
+function loadManifest() {
+    return fetch(MANIFEST_URL + '?v=' + BUILD_VERSION, { cache: 'no-store' })
+        .then(res => res.json());
+}
+
+let revisionsPromise = null;
+
+// url（相对于 scope）-> 缓存键
+function getRevisions() {
+    if (!revisionsPromise) {
+        revisionsPromise = caches.open(CACHE_NAME)
+            .then(cache => cache.match(MANIFEST_URL))
+            .then(res => res ? res.json() : loadManifest())
+            .then(manifest => {
+                const map = new Map();
+                manifest.entries.forEach(entry => map.set(entry.url, cacheKey(entry)));
+                return map;
+            });
+    }
+    return revisionsPromise;
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const manifest = await loadManifest();
+        const cache = await caches.open(CACHE_NAME);
+
+        // 只下载新增或内容有变化的资源
+        await Promise.all(manifest.entries.map(async entry => {
+            const key = cacheKey(entry);
+            if (await cache.match(key)) {
+                return;
+            }
+            const res = await fetch(entry.url, { cache: 'reload' });
+            if (!res.ok) {
+                throw new Error('预缓存失败: ' + entry.url);
+            }
+            await cache.put(key, res);
+        }));
+
+        await cache.put(MANIFEST_URL, new Response(JSON.stringify(manifest), {
+            headers: { 'Content-Type': 'application/json' }
+        }));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        revisionsPromise = null;
+        const revisions = await getRevisions();
+        const wanted = new Set(revisions.values());
+        const cache = await caches.open(CACHE_NAME);
+
+        // 清理旧版本遗留的资源
+        const manifestKey = new URL(MANIFEST_URL, self.registration.scope).href;
+        const requests = await cache.keys();
+        await Promise.all(requests
+            .filter(req => req.url !== manifestKey && !wanted.has(req.url))
+            .map(req => cache.delete(req)));
+
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET' || !request.url.startsWith(self.registration.scope)) {
+        return;
+    }
+
+    const url = new URL(request.url);
+    let path = url.pathname.slice(new URL(self.registration.scope).pathname.length);
+    if (path === '' || path.endsWith('/')) {
+        path += 'index.html';
+    }
+
+    event.respondWith((async () => {
+        const revisions = await getRevisions();
+        const key = revisions.get(decodeURIComponent(path));
+        if (key) {
+            const cached = await caches.match(key);
+            if (cached) {
+                return cached;
+            }
+        }
+        return fetch(request);
+    })());
+});